@@ -1,15 +1,39 @@
 """This module contains a POST endpoint to trigger a ML model for predicting rental home prices."""
 
+import time
+
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from typing import Annotated, Any
+
 import pandas as pd
 
-from fastapi import FastAPI
+from fastapi import Body, FastAPI
 from pydantic import BaseModel, Field, NonNegativeFloat, PositiveFloat, PositiveInt
 
-from src.model_inference import ModelInferenceService
+from src.model_inference import EXPLANATION_CONFIG, ModelInferenceService
+from src.prediction_log import PredictionLogService
+
+prediction_log: PredictionLogService = PredictionLogService()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """Starts the prediction log when the app starts and flushes it when the app shuts down.
+
+    Args:
+        app (FastAPI): The application.
+    """
+    prediction_log.start()
+    yield
+    prediction_log.stop()
+
 
 app: FastAPI = FastAPI(
     title="Rental Home Price Prediction Service",
-    description="REST API to predict rental home prices in Amsterdam"
+    description="REST API to predict rental home prices in Amsterdam",
+    lifespan=lifespan
 )
 
 
@@ -44,6 +68,8 @@ def get_prediction(user_input: RentalHome):
         dict[str, int]: Estimated rent of the rental home.
     """
     try:
+        start: float = time.perf_counter()
+
         # get the input record
         record: dict[str, float | int | str] = user_input.model_dump()
 
@@ -55,6 +81,59 @@ def get_prediction(user_input: RentalHome):
 
         # get the prediction
         prediction: int = service.predict(record)
+
+        # hand the served prediction off to the background prediction log
+        prediction_log.log({
+            "created_at": datetime.now(timezone.utc),
+            "model_version": service.model_version,
+            **record,
+            "prediction": prediction,
+            "latency_ms": (time.perf_counter() - start) * 1000
+        })
         return {"Estimated rent (USD)": prediction}
     except Exception as e:
         raise e
+
+
+@app.post("/predict/explain", response_model=list[dict[str, Any]])
+def get_explanations(
+    user_inputs: Annotated[
+        list[RentalHome], Body(min_length=1, max_length=EXPLANATION_CONFIG.max_batch_size)
+    ],
+    interactions: bool = False,
+):
+    """Returns the estimated rent of each potential rental home, along with each feature's
+    contribution to it.
+
+    Args:
+        user_inputs (list[RentalHome]): Information about the rental homes, at most
+        EXPLANATION_CONFIG.max_batch_size of them.
+        interactions (bool, optional): Whether to include the pairwise feature interaction
+        values. Defaults to False.
+
+    Returns:
+        list[dict[str, Any]]: Estimated rent, bias, and feature contributions of each rental
+        home.
+    """
+    try:
+        # get the input records
+        records: list[dict[str, float | int | str]] = [
+            user_input.model_dump() for user_input in user_inputs
+        ]
+
+        # instantiate the inference service
+        service: ModelInferenceService = ModelInferenceService()
+
+        # load the trained ML model
+        service.load_model()
+
+        # get the explanations
+        return [
+            {
+                "Estimated rent (USD)": explanation["prediction"],
+                **{key: value for key, value in explanation.items() if key != "prediction"}
+            }
+            for explanation in service.explain_batch(records, interactions)
+        ]
+    except Exception as e:
+        raise e
@@ -17,6 +17,10 @@ class Paths:
         CONFIG (PosixPath): Project's configuration file path, ~/config.yaml.
         RAW_DATA (PosixPath): Project's raw data file path, ~/data/raw.parquet.
         MODEL (PosixPath): Project's trained ML model file path, ~/artifacts/model.pkl.
+        EVALUATION_REPORT (PosixPath): Project's model evaluation report file path,
+        ~/artifacts/evaluation.json.
+        PREDICTIONS_DIR (PosixPath): Project's directory for prediction logs that couldn't be
+        written to the database, ~/data/predictions/.
     """
 
     PROJECT_DIR: PosixPath = Path(__file__).parent.parent.absolute()
@@ -27,6 +31,8 @@ class Paths:
     CONFIG: PosixPath = PROJECT_DIR / "config.yaml"
     RAW_DATA: PosixPath = DATA_DIR / "raw.parquet"
     MODEL: PosixPath = ARTIFACTS_DIR / "model.pkl"
+    EVALUATION_REPORT: PosixPath = ARTIFACTS_DIR / "evaluation.json"
+    PREDICTIONS_DIR: PosixPath = DATA_DIR / "predictions"
 
 
 def load_config(path: PosixPath = Paths.CONFIG) -> DictConfig:
@@ -86,6 +86,64 @@ def create_table() -> None:
         raise e
 
 
+def create_predictions_table() -> None:
+    """Creates a table named, 'predictions', under the 'postgres' database's 'rentals' schema."""
+    try:
+        db_connection: Connection = get_db_connection()
+        db_connection.execute(text(
+            f"""
+            CREATE TABLE IF NOT EXISTS {DB_CONFIG.schema}.{DB_CONFIG.predictions_table}
+            (
+                created_at TIMESTAMPTZ,
+                model_version TEXT,
+                year_built INTEGER,
+                area REAL,
+                bedrooms INTEGER,
+                bathrooms REAL,
+                furnished TEXT,
+                storage TEXT,
+                garage TEXT,
+                parking TEXT,
+                balcony TEXT,
+                garden_size REAL,
+                neighborhood_id INTEGER,
+                prediction INTEGER,
+                latency_ms REAL
+            )
+            """
+        ))
+        db_connection.commit()
+        db_connection.close()
+    except Exception as e:
+        raise e
+
+
+def write_predictions(data: pd.DataFrame, chunksize: int = 1000) -> None:
+    """Bulk-inserts served predictions into the 'postgres' database's 'rentals.predictions'
+    table.
+
+    Args:
+        data (pd.DataFrame): Served predictions, one record per row.
+        chunksize (int, optional): Number of rows per multi-row INSERT statement.
+        Defaults to 1000.
+    """
+    try:
+        db_connection: Connection = get_db_connection()
+        data.to_sql(
+            con=db_connection,
+            schema=DB_CONFIG.schema,
+            name=DB_CONFIG.predictions_table,
+            if_exists="append",
+            index=False,
+            method="multi",
+            chunksize=chunksize
+        )
+        db_connection.commit()
+        db_connection.close()
+    except Exception as e:
+        raise e
+
+
 @logger.catch
 def write_table(path: PosixPath | str = Paths.RAW_DATA) -> None:
     """Writes path to the 'postgres' database's 'rentals.raw' table.
@@ -148,6 +206,31 @@ def read_table() -> pd.DataFrame:
         raise e
 
 
+def read_predictions(limit: int = 5000) -> pd.DataFrame:
+    """Queries the 'postgres' database's 'rentals.predictions' table and returns the most recent
+    served predictions as a pd.DataFrame.
+
+    Args:
+        limit (int, optional): Maximum number of predictions to return. Defaults to 5000.
+
+    Returns:
+        pd.DataFrame: Served predictions, ordered from oldest to newest.
+    """
+    try:
+        db_connection: Connection = get_db_connection()
+        script: str = f"""
+SELECT *
+FROM {DB_CONFIG.schema}.{DB_CONFIG.predictions_table}
+ORDER BY created_at DESC
+LIMIT {int(limit)}
+        """
+        data: pd.DataFrame = pd.DataFrame(db_connection.execute(text(script)))
+        db_connection.close()
+        return data.iloc[::-1].reset_index(drop=True)
+    except Exception as e:
+        raise e
+
+
 def aggregate_neighborhood_ids() -> pd.DataFrame:
     """Returns a pd.DataFrame containing the average area (m²), average number
     of bedrooms, average number of bathrooms, and average garden size (m²) for
@@ -1,27 +1,41 @@
 """This module provides functionality for the ML model building process."""
 
+import json
+import multiprocessing
+import os
 import pickle
 
+from concurrent.futures import Future, ProcessPoolExecutor
+from datetime import datetime, timezone
 from pathlib import PosixPath
 
 import numpy as np
 import pandas as pd
 
-from omegaconf import DictConfig
+from omegaconf import DictConfig, OmegaConf
+from sklearn.model_selection import KFold, TimeSeriesSplit
 from sklearn.utils import shuffle
 from xgboost import XGBRegressor
 
 from src.config import Paths, load_config
-from src.data import DATA_CONFIG, encode_neighborhood_ids, preprocess_data
+from src.data import (
+    DATA_CONFIG,
+    encode_binary_features,
+    encode_neighborhood_ids,
+    preprocess_data,
+)
 from src.database import read_table
 from src.logger import logger
+from src.prediction_log import load_predictions
 
 MODEL_CONFIG: DictConfig = load_config().model
+EVAL_CONFIG: DictConfig = load_config().evaluation
 
 
 def split_data(
     data: pd.DataFrame,
     train_size: float = 0.75,
+    random_state: int = MODEL_CONFIG.random_state,
 ) -> tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame, pd.Series, pd.Series, pd.Series]:
     """Splits ML-ready data into train, validation, and test sets.
 
@@ -29,6 +43,8 @@ def split_data(
         data (pd.DataFrame): Dataset containing ML-ready features and the target
         train_size (float, optional): Percentage of data reserved for training.
         Defaults to 0.75.
+        random_state (int, optional): Seed used to shuffle 'data'.
+        Defaults to MODEL_CONFIG.random_state.
 
     Returns:
         tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame, pd.Series, pd.Series, pd.Series]:
@@ -40,7 +56,7 @@ def split_data(
         )
         target: str = DATA_CONFIG.target
         features: list[str] = data.drop(target, axis=1).columns.tolist()
-        data = shuffle(data)
+        data = shuffle(data, random_state=random_state)
         n_records: int = data.shape[0]
         train_split: int = int(round(train_size * n_records))
         val_split: int = train_split + int(round((n_records - train_split) / 2))
@@ -84,14 +100,410 @@ def compute_rsquared(
         raise e
 
 
+def make_folds(
+    data: pd.DataFrame,
+    method: str = EVAL_CONFIG.method,
+    n_splits: int = EVAL_CONFIG.n_splits,
+    random_state: int = MODEL_CONFIG.random_state,
+) -> list[tuple[np.ndarray, np.ndarray]]:
+    """Returns the train and test row positions of each cross-validation fold.
+
+    Args:
+        data (pd.DataFrame): Dataset containing ML-ready features and the target.
+        method (str, optional): 'kfold' for shuffled k-fold cross-validation, or 'time' for
+        expanding-window cross-validation ordered by 'year_built'. Defaults to EVAL_CONFIG.method.
+        n_splits (int, optional): Number of folds. Defaults to EVAL_CONFIG.n_splits.
+        random_state (int, optional): Seed used to shuffle the k-fold splits.
+        Defaults to MODEL_CONFIG.random_state.
+
+    Raises:
+        ValueError: If 'method' is neither 'kfold' nor 'time'.
+
+    Returns:
+        list[tuple[np.ndarray, np.ndarray]]: Train and test row positions of each fold.
+    """
+    try:
+        if method == "kfold":
+            splitter: KFold = KFold(n_splits=n_splits, shuffle=True, random_state=random_state)
+            return list(splitter.split(data))
+        if method == "time":
+            # the data has no listing dates, so the construction year orders the records
+            order: np.ndarray = np.argsort(data["year_built"].to_numpy(), kind="stable")
+            return [
+                (order[train_idx], order[test_idx])
+                for train_idx, test_idx in TimeSeriesSplit(n_splits=n_splits).split(order)
+            ]
+        raise ValueError(f"Unknown cross-validation method, '{method}'. Use 'kfold' or 'time'.")
+    except Exception as e:
+        raise e
+
+
+def fit_predict_fold(
+    x_train: pd.DataFrame,
+    y_train: pd.Series,
+    x_val: pd.DataFrame,
+    y_val: pd.Series,
+    x_test: pd.DataFrame,
+    hyperparams: dict[str, float | int],
+) -> np.ndarray:
+    """Trains an object of type, 'XGBRegressor', on a single fold and returns its predictions
+    on the fold's test set.
+
+    Args:
+        x_train (pd.DataFrame): Train set features.
+        y_train (pd.Series): Train set targets.
+        x_val (pd.DataFrame): Validation set features, used for early stopping.
+        y_val (pd.Series): Validation set targets, used for early stopping.
+        x_test (pd.DataFrame): Test set features.
+        hyperparams (dict[str, float | int]): XGBRegressor hyperparameters.
+
+    Returns:
+        np.ndarray: Test set predictions.
+    """
+    try:
+        model: XGBRegressor = XGBRegressor(**hyperparams)
+        model.fit(x_train, y_train, eval_set=[(x_val, y_val)], verbose=False)
+        return model.predict(x_test)
+    except Exception as e:
+        raise e
+
+
+def cross_validate(
+    data: pd.DataFrame,
+    folds: list[tuple[np.ndarray, np.ndarray]],
+    method: str = EVAL_CONFIG.method,
+    val_size: float = EVAL_CONFIG.val_size,
+    n_workers: None | int = EVAL_CONFIG.n_workers,
+    random_state: int = MODEL_CONFIG.random_state,
+) -> np.ndarray:
+    """Trains one model per fold across a process pool and returns the out-of-fold predictions.
+
+    Args:
+        data (pd.DataFrame): Dataset containing ML-ready features and the target.
+        folds (list[tuple[np.ndarray, np.ndarray]]): Train and test row positions of each fold.
+        method (str, optional): Cross-validation method that produced 'folds'.
+        Defaults to EVAL_CONFIG.method.
+        val_size (float, optional): Percentage of each fold's train set reserved for early
+        stopping. Defaults to EVAL_CONFIG.val_size.
+        n_workers (None | int, optional): Number of worker processes. If None, one per fold, up
+        to the number of CPUs. Defaults to EVAL_CONFIG.n_workers.
+        random_state (int, optional): Seed used to carve the validation sets.
+        Defaults to MODEL_CONFIG.random_state.
+
+    Returns:
+        np.ndarray: Out-of-fold predictions, NaN for records that never land in a test set.
+    """
+    try:
+        target: str = DATA_CONFIG.target
+        x: pd.DataFrame = data.drop(target, axis=1)
+        y: pd.Series = data[target]
+        n_cpus: int = os.cpu_count() or 1
+        n_workers = n_workers or min(len(folds), n_cpus)
+
+        # split the CPUs between the workers so the boosters don't oversubscribe them
+        hyperparams: dict[str, float | int] = {
+            **OmegaConf.to_container(MODEL_CONFIG.hyperparams),
+            "n_jobs": max(1, n_cpus // n_workers),
+        }
+        rng: np.random.Generator = np.random.default_rng(random_state)
+        predictions: np.ndarray = np.full(len(data), np.nan)
+
+        # 'spawn' avoids forking a parent whose OpenMP thread pool is already in use
+        with ProcessPoolExecutor(
+            max_workers=n_workers, mp_context=multiprocessing.get_context("spawn")
+        ) as executor:
+            futures: list[tuple[np.ndarray, Future]] = []
+            for train_idx, test_idx in folds:
+                # time-based folds keep their most recent records for validation
+                if method == "kfold":
+                    train_idx = rng.permutation(train_idx)
+                n_val: int = max(1, int(round(val_size * len(train_idx))))
+                fit_idx, val_idx = train_idx[:-n_val], train_idx[-n_val:]
+                futures.append((
+                    test_idx,
+                    executor.submit(
+                        fit_predict_fold,
+                        x.iloc[fit_idx],
+                        y.iloc[fit_idx],
+                        x.iloc[val_idx],
+                        y.iloc[val_idx],
+                        x.iloc[test_idx],
+                        hyperparams,
+                    )
+                ))
+            for test_idx, future in futures:
+                predictions[test_idx] = future.result()
+        return predictions
+    except Exception as e:
+        raise e
+
+
+def compute_metrics(
+    y: np.ndarray,
+    yhat: np.ndarray,
+) -> dict[str, np.ndarray]:
+    """Computes the R², mean absolute error, and mean absolute percentage error between y and
+    yhat along their last axis, so a batch of resamples can be scored in a single pass.
+
+    Args:
+        y (np.ndarray): Labels, of shape (n,) or (n_resamples, n).
+        yhat (np.ndarray): Predictions, of the same shape as 'y'.
+
+    Returns:
+        dict[str, np.ndarray]: R², MAE, and MAPE, one value per resample.
+    """
+    try:
+        residuals: np.ndarray = y - yhat
+        sse: np.ndarray = np.square(residuals).sum(axis=-1)
+        sst: np.ndarray = np.square(y - y.mean(axis=-1, keepdims=True)).sum(axis=-1)
+        abs_errors: np.ndarray = np.abs(residuals)
+
+        # records with a zero label are excluded from the MAPE
+        nonzero: np.ndarray = y != 0
+        pct_errors: np.ndarray = np.divide(
+            abs_errors, np.abs(y), out=np.zeros_like(abs_errors, dtype=float), where=nonzero
+        )
+        return {
+            "r_squared": 1 - (sse / sst),
+            "mae": abs_errors.mean(axis=-1),
+            "mape": pct_errors.sum(axis=-1) / nonzero.sum(axis=-1),
+        }
+    except Exception as e:
+        raise e
+
+
+def bootstrap_metrics(
+    y: np.ndarray,
+    yhat: np.ndarray,
+    n_bootstrap: int = EVAL_CONFIG.n_bootstrap,
+    confidence_level: float = EVAL_CONFIG.confidence_level,
+    random_state: int = MODEL_CONFIG.random_state,
+) -> dict[str, dict[str, float]]:
+    """Computes point estimates and bootstrap confidence intervals of the R², MAE, and MAPE.
+
+    Args:
+        y (np.ndarray): Labels.
+        yhat (np.ndarray): Predictions.
+        n_bootstrap (int, optional): Number of bootstrap resamples.
+        Defaults to EVAL_CONFIG.n_bootstrap.
+        confidence_level (float, optional): Confidence level of the intervals.
+        Defaults to EVAL_CONFIG.confidence_level.
+        random_state (int, optional): Seed used to draw the resamples.
+        Defaults to MODEL_CONFIG.random_state.
+
+    Returns:
+        dict[str, dict[str, float]]: Each metric's point estimate, lower bound, and upper bound.
+    """
+    try:
+        rng: np.random.Generator = np.random.default_rng(random_state)
+        n_records: int = y.size
+
+        # score the resamples in batches of ~4M elements to bound the memory footprint
+        batch_size: int = max(1, (1 << 22) // n_records)
+        batches: list[dict[str, np.ndarray]] = []
+        for start in range(0, n_bootstrap, batch_size):
+            idx: np.ndarray = rng.integers(
+                0, n_records, size=(min(batch_size, n_bootstrap - start), n_records)
+            )
+            batches.append(compute_metrics(y[idx], yhat[idx]))
+        point_estimates: dict[str, np.ndarray] = compute_metrics(y, yhat)
+        alpha: float = (1 - confidence_level) / 2
+        report: dict[str, dict[str, float]] = {}
+        for metric, estimate in point_estimates.items():
+            samples: np.ndarray = np.concatenate([batch[metric] for batch in batches])
+            lower, upper = np.quantile(samples, [alpha, 1 - alpha])
+            report[metric] = {
+                "estimate": float(estimate),
+                "lower": float(lower),
+                "upper": float(upper),
+            }
+        return report
+    except Exception as e:
+        raise e
+
+
+def compute_group_errors(
+    y: np.ndarray,
+    yhat: np.ndarray,
+    groups: np.ndarray,
+) -> dict[str, dict[str, None | float]]:
+    """Computes the number of records, MAE, and MAPE for each group.
+
+    Args:
+        y (np.ndarray): Labels.
+        yhat (np.ndarray): Predictions.
+        groups (np.ndarray): Group label of each record.
+
+    Returns:
+        dict[str, dict[str, None | float]]: Number of records, MAE, and MAPE, keyed by group
+        label. The MAPE is None for groups whose labels are all zero.
+    """
+    try:
+        abs_errors: np.ndarray = np.abs(y - yhat)
+        errors: pd.DataFrame = pd.DataFrame({
+            "group": groups,
+            "abs_error": abs_errors,
+            "pct_error": abs_errors / np.where(y != 0, np.abs(y), np.nan),
+        })
+        summary: pd.DataFrame = errors.groupby("group").agg(
+            n=("abs_error", "size"),
+            mae=("abs_error", "mean"),
+            mape=("pct_error", "mean"),
+        )
+        return {
+            str(group): {
+                "n": int(row.n),
+                "mae": float(row.mae),
+                "mape": float(row.mape) if pd.notna(row.mape) else None,
+            }
+            for group, row in summary.iterrows()
+        }
+    except Exception as e:
+        raise e
+
+
+def compute_drift(
+    reference: pd.DataFrame,
+    current: pd.DataFrame,
+    categorical_features: tuple[str, ...] = (
+        *EVAL_CONFIG.categorical_features, *DATA_CONFIG.binary_features
+    ),
+    n_bins: int = EVAL_CONFIG.drift_bins,
+) -> dict[str, dict[str, None | float]]:
+    """Compares each feature's distribution in 'current' against 'reference' using the
+    population stability index (PSI). Categorical features are binned by their values, and
+    numeric features by the quantiles of 'reference'.
+
+    Args:
+        reference (pd.DataFrame): Features the model was trained on.
+        current (pd.DataFrame): Features of recently served predictions.
+        categorical_features (tuple[str, ...], optional): Features binned by their values.
+        Defaults to EVAL_CONFIG.categorical_features and DATA_CONFIG.binary_features.
+        n_bins (int, optional): Maximum number of bins per numeric feature.
+        Defaults to EVAL_CONFIG.drift_bins.
+
+    Returns:
+        dict[str, dict[str, None | float]]: Each feature's PSI and its mean in both datasets.
+        The PSI and current mean are None if 'current' has no values for the feature, and the
+        means are None for non-binary categorical features, such as IDs.
+    """
+    try:
+        eps: float = 1e-6
+        quantiles: np.ndarray = np.linspace(0, 1, n_bins + 1)[1:-1]
+        report: dict[str, dict[str, None | float]] = {}
+        for feature in reference.columns:
+            ref_values: pd.Series = reference[feature]
+            cur_values: pd.Series = current[feature].dropna()
+            if feature in categorical_features:
+                ref_counts: pd.Series = ref_values.value_counts()
+                cur_counts: pd.Series = cur_values.value_counts()
+                categories: pd.Index = ref_counts.index.union(cur_counts.index)
+                ref_share: np.ndarray = ref_counts.reindex(categories, fill_value=0).to_numpy()
+                cur_share: np.ndarray = cur_counts.reindex(categories, fill_value=0).to_numpy()
+            else:
+                edges: np.ndarray = np.unique(
+                    np.quantile(ref_values.to_numpy(dtype=float), quantiles)
+                )
+                ref_share = np.bincount(
+                    np.searchsorted(edges, ref_values.to_numpy(dtype=float), side="right"),
+                    minlength=edges.size + 1,
+                )
+                cur_share = np.bincount(
+                    np.searchsorted(edges, cur_values.to_numpy(dtype=float), side="right"),
+                    minlength=edges.size + 1,
+                )
+            has_mean: bool = (
+                feature not in categorical_features or feature in DATA_CONFIG.binary_features
+            )
+            if cur_values.empty:
+                psi: None | float = None
+            else:
+                ref_share = np.clip(ref_share / ref_values.size, eps, None)
+                cur_share = np.clip(cur_share / cur_values.size, eps, None)
+                psi = float(np.sum((cur_share - ref_share) * np.log(cur_share / ref_share)))
+            report[feature] = {
+                "psi": psi,
+                "reference_mean": float(ref_values.astype(float).mean()) if has_mean else None,
+                "current_mean": (
+                    float(cur_values.astype(float).mean())
+                    if has_mean and not cur_values.empty else None
+                ),
+            }
+        return report
+    except Exception as e:
+        raise e
+
+
+def evaluate_model(
+    data: pd.DataFrame,
+    reference: pd.DataFrame,
+    method: str = EVAL_CONFIG.method,
+    n_splits: int = EVAL_CONFIG.n_splits,
+) -> dict[str, object]:
+    """Cross-validates the model and reports its overall, per-neighborhood, and
+    per-'year_built'-bucket errors, along with the drift between the training features and
+    recently served predictions.
+
+    Args:
+        data (pd.DataFrame): Dataset containing ML-ready features and the target.
+        reference (pd.DataFrame): Pre-processed dataset, row-aligned with 'data', that still
+        contains the 'neighborhood_id' feature.
+        method (str, optional): 'kfold' or 'time'. Defaults to EVAL_CONFIG.method.
+        n_splits (int, optional): Number of folds. Defaults to EVAL_CONFIG.n_splits.
+
+    Returns:
+        dict[str, object]: Evaluation report.
+    """
+    try:
+        logger.info(
+            f"Running {n_splits}-fold '{method}' cross-validation across a process pool."
+        )
+        folds: list[tuple[np.ndarray, np.ndarray]] = make_folds(data, method, n_splits)
+        yhat: np.ndarray = cross_validate(data, folds, method)
+        scored: np.ndarray = ~np.isnan(yhat)
+        y: np.ndarray = data[DATA_CONFIG.target].to_numpy(dtype=float)[scored]
+        yhat = yhat[scored]
+        bucket_size: int = EVAL_CONFIG.year_built_bucket_size
+        year_buckets: np.ndarray = (
+            reference["year_built"].to_numpy()[scored] // bucket_size * bucket_size
+        )
+
+        # compare the training features against the most recently served predictions
+        features: list[str] = list(DATA_CONFIG.features)
+        predictions: pd.DataFrame = load_predictions(EVAL_CONFIG.drift_window)
+        if predictions.empty:
+            logger.warning("No served predictions found. Skipping the drift report.")
+            drift: dict[str, dict[str, None | float]] = {}
+        else:
+            drift = compute_drift(
+                reference[features], predictions[features].pipe(encode_binary_features)
+            )
+        return {
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "method": method,
+            "n_splits": n_splits,
+            "n_records": int(scored.sum()),
+            "metrics": bootstrap_metrics(y, yhat),
+            "neighborhood_errors": compute_group_errors(
+                y, yhat, reference["neighborhood_id"].to_numpy()[scored]
+            ),
+            "year_built_errors": compute_group_errors(y, yhat, year_buckets),
+            "drift": {"n_predictions": len(predictions), "features": drift},
+        }
+    except Exception as e:
+        raise e
+
+
 @logger.catch
 def build_model() -> None:
     """Trains an object of type, 'XGBRegressor', evaluates it against 'baseline'
-    predictions, and saves it to ~/artifacts/model.pkl.
+    predictions, saves it to ~/artifacts/model.pkl, and writes its cross-validation and drift
+    report to ~/artifacts/evaluation.json.
     """
     try:
         # fetch, pre-process, and transform the raw data into ML-ready features and targets
-        data: pd.DataFrame = read_table().pipe(preprocess_data).pipe(encode_neighborhood_ids)
+        preprocessed: pd.DataFrame = read_table().pipe(preprocess_data)
+        data: pd.DataFrame = preprocessed.pipe(encode_neighborhood_ids)
 
         # split the ML-ready data into train, validation, and test sets
         x_train, x_val, x_test, y_train, y_val, y_test = split_data(data)
@@ -118,5 +530,17 @@ produced a test set R² of {model_metric}.")
         artifacts_dir.mkdir(parents=True, exist_ok=True)
         with open(Paths.MODEL, "wb") as file:
             pickle.dump(model, file)
+
+        # cross-validate the model and save the report next to it
+        report: dict[str, object] = evaluate_model(data, preprocessed)
+        metrics: dict[str, dict[str, float]] = report["metrics"]
+        logger.info(
+            f"Cross-validated R² of {metrics['r_squared']['estimate']:.2f} \
+({metrics['r_squared']['lower']:.2f}, {metrics['r_squared']['upper']:.2f}), MAE of \
+{metrics['mae']['estimate']:.2f}, and MAPE of {metrics['mape']['estimate']:.2%}. \
+Saving the evaluation report to '{Paths.EVALUATION_REPORT}'."
+        )
+        with open(Paths.EVALUATION_REPORT, "w") as file:
+            json.dump(report, file, indent=2, allow_nan=False)
     except Exception as e:
         raise e
@@ -1,17 +1,30 @@
 """This module provides the functionality for making predictions."""
 
+import copy
+import hashlib
 import pickle
+import threading
 
+from collections import OrderedDict
 from pathlib import PosixPath
 
+import numpy as np
 import pandas as pd
 
-from xgboost import XGBRegressor
+from omegaconf import DictConfig
+from xgboost import Booster, DMatrix, XGBRegressor
 
-from src.config import Paths
+from src.config import Paths, load_config
 from src.data import encode_binary_features, encode_neighborhood_ids
 from src.logger import logger
 
+EXPLANATION_CONFIG: DictConfig = load_config().explanation
+
+# explanations are shared across service instances and keyed by model version, so repeated
+# inputs are served from memory even though the app creates a service per request
+_explanation_cache: OrderedDict = OrderedDict()
+_explanation_cache_lock: threading.Lock = threading.Lock()
+
 
 class ModelInferenceService:
     """
@@ -20,18 +33,24 @@ class ModelInferenceService:
     Attributes:
         model_path (PosixPath): Trained ML model's file path. Defaults to Paths.MODEL.
         model (None | XGBRegressor): Trained ML model. Defaults to None.
+        model_version (None | str): Short SHA-256 digest of 'model_path'. Defaults to None.
 
     Methods:
         __init__: Constructor that initializes the ModelInferenceService.
         load_model: Loads the trained ML model from 'model_path' or raises
         FileNotFoundError if 'model_path' doesn't exist.
         predict: Makes a prediction using 'model'.
+        transform: Transforms input records into the features 'model' was trained on.
+        iteration_range: Returns the range of boosting rounds 'model.predict' uses.
+        explain_batch: Explains a batch of predictions with the booster's native feature
+        contributions.
     """
 
     def __init__(self) -> None:
         """Initializes the ModelInferenceService."""
         self.model_path: PosixPath = Paths.MODEL
         self.model: None | XGBRegressor = None
+        self.model_version: None | str = None
 
     def load_model(self) -> None:
         """Loads the trained ML model from 'model_path'
@@ -50,7 +69,9 @@ class ModelInferenceService:
 Loading the trained ML model."
         )
         with open(self.model_path, "rb") as file:
-            self.model = pickle.load(file)
+            model_bytes: bytes = file.read()
+        self.model = pickle.loads(model_bytes)
+        self.model_version = hashlib.sha256(model_bytes).hexdigest()[:12]
 
     def predict(self, record: dict[str, float | int | str]) -> int:
         """Makes a prediction using 'model'.
@@ -62,11 +83,130 @@ Loading the trained ML model."
             int: Rental prediction.
         """
         logger.info("Generating the prediction...")
-        x: pd.DataFrame = (
-            pd.DataFrame([record])
+        x: pd.DataFrame = self.transform([record])
+        prediction: float = self.model.predict(x)[0]
+        return max(0, int(round(prediction)))
+
+    def transform(self, records: list[dict[str, float | int | str]]) -> pd.DataFrame:
+        """Transforms input records into the features 'model' was trained on.
+
+        Args:
+            records (list[dict[str, float | int | str]]): Input data for making predictions.
+
+        Returns:
+            pd.DataFrame: ML-ready features, one row per record.
+        """
+        return (
+            pd.DataFrame(records)
             .pipe(encode_binary_features)
             .pipe(encode_neighborhood_ids)
             [self.model.feature_names_in_]
         )
-        prediction: float = self.model.predict(x)[0]
-        return max(0, int(round(prediction)))
+
+    def iteration_range(self) -> tuple[int, int]:
+        """Returns the range of boosting rounds 'model.predict' uses, that is, up to the early
+        stopping iteration, or every round if early stopping wasn't used.
+
+        Returns:
+            tuple[int, int]: Boosting round range, as expected by 'Booster.predict'.
+        """
+        try:
+            return (0, self.model.best_iteration + 1)
+        except AttributeError:
+            return (0, 0)
+
+    def explain_batch(
+        self,
+        records: list[dict[str, float | int | str]],
+        interactions: bool = False,
+    ) -> list[dict[str, object]]:
+        """Explains a batch of predictions with the booster's native SHAP values, that is,
+        'pred_contribs' and, optionally, 'pred_interactions'. Explanations of previously seen
+        feature rows are served from an in-memory LRU cache.
+
+        Args:
+            records (list[dict[str, float | int | str]]): Input data for making predictions.
+            interactions (bool, optional): Whether to include the pairwise feature interaction
+            values. Defaults to False.
+
+        Returns:
+            list[dict[str, object]]: Each record's prediction, bias, and per-feature
+            contributions, plus its feature interactions if 'interactions' is True. These are
+            copies, so callers may mutate them without corrupting the cache.
+        """
+        logger.info(f"Explaining a batch of {len(records)} prediction(s)...")
+        # key on the transformed features, so a change in the neighborhood aggregates misses
+        x: pd.DataFrame = self.transform(records)
+        keys: list[tuple] = [
+            (self.model_version, interactions, row) for row in x.itertuples(index=False, name=None)
+        ]
+        explanations: dict[tuple, dict[str, object]] = {}
+        with _explanation_cache_lock:
+            for key in keys:
+                if key in _explanation_cache:
+                    _explanation_cache.move_to_end(key)
+                    explanations[key] = _explanation_cache[key]
+
+        # explain each distinct cache miss once, in a single vectorized pass
+        misses: dict[tuple, int] = {}
+        for position, key in enumerate(keys):
+            if key not in explanations and key not in misses:
+                misses[key] = position
+        if misses:
+            miss_keys: list[tuple] = list(misses)
+            explanations.update(
+                zip(miss_keys, self._explain(x.iloc[list(misses.values())], interactions))
+            )
+            with _explanation_cache_lock:
+                for key in miss_keys:
+                    _explanation_cache[key] = explanations[key]
+                while len(_explanation_cache) > EXPLANATION_CONFIG.cache_size:
+                    _explanation_cache.popitem(last=False)
+        return [copy.deepcopy(explanations[key]) for key in keys]
+
+    def _explain(
+        self,
+        x: pd.DataFrame,
+        interactions: bool,
+    ) -> list[dict[str, object]]:
+        """Computes the explanations of 'x' with the booster's native SHAP values.
+
+        Args:
+            x (pd.DataFrame): ML-ready features, one row per record.
+            interactions (bool): Whether to include the pairwise feature interaction values.
+
+        Returns:
+            list[dict[str, object]]: Each record's prediction, bias, and per-feature
+            contributions, plus its feature interactions if 'interactions' is True.
+        """
+        dmatrix: DMatrix = DMatrix(x)
+        names: list[str] = [*self.model.feature_names_in_, "bias"]
+        iteration_range: tuple[int, int] = self.iteration_range()
+        booster: Booster = self.model.get_booster()
+        contributions: np.ndarray = booster.predict(
+            dmatrix, pred_contribs=True, iteration_range=iteration_range
+        )
+        explanations: list[dict[str, object]] = [
+            {
+                "prediction": max(0, int(round(float(row.sum())))),
+                "bias": float(row[-1]),
+                "contributions": dict(zip(names[:-1], row[:-1].tolist())),
+            }
+            for row in contributions
+        ]
+        if interactions:
+            values: np.ndarray = booster.predict(
+                dmatrix, pred_interactions=True, iteration_range=iteration_range
+            )
+            for explanation, matrix in zip(explanations, values):
+                explanation["interactions"] = {
+                    name: dict(zip(names, matrix_row))
+                    for name, matrix_row in zip(names, matrix.tolist())
+                }
+        return explanations
+
+
+def clear_explanation_cache() -> None:
+    """Empties the explanation cache shared by every ModelInferenceService."""
+    with _explanation_cache_lock:
+        _explanation_cache.clear()
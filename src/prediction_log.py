@@ -0,0 +1,219 @@
+"""This module provides functionality for logging served predictions in the background."""
+
+import threading
+
+from collections import deque
+from datetime import datetime
+from pathlib import PosixPath
+
+import pandas as pd
+
+from omegaconf import DictConfig
+
+from src.config import Paths, load_config
+from src.database import (
+    create_predictions_table,
+    create_schema,
+    read_predictions,
+    write_predictions,
+)
+from src.logger import logger
+
+LOG_CONFIG: DictConfig = load_config().prediction_log
+
+
+class PredictionLogService:
+    """
+    A class that buffers served predictions in memory and periodically bulk-writes them to the
+    'postgres' database's 'rentals.predictions' table, or to local parquet files if the database
+    is unavailable. The parquet files are written back to the table, and deleted, on the next
+    flush that reaches the database, so an outage leaves no gap in the table.
+
+    Attributes:
+        buffer (deque): Bounded ring buffer of served predictions awaiting a flush. When it's
+        full, the oldest record is overwritten and counted as dropped.
+        flush_interval (float): Number of seconds between background flushes.
+        chunksize (int): Number of rows per multi-row INSERT statement.
+        spill_dir (PosixPath): Directory that receives the parquet files written when the
+        database is unavailable. Defaults to Paths.PREDICTIONS_DIR.
+        dropped (int): Number of records dropped because the buffer was full.
+
+    Methods:
+        __init__: Constructor that initializes the PredictionLogService.
+        start: Starts the background thread that flushes 'buffer'.
+        stop: Stops the background thread and flushes whatever is left in 'buffer'.
+        log: Adds a served prediction to 'buffer' without blocking on any I/O.
+        flush: Drains 'buffer' and writes its records to the database or 'spill_dir', then
+        replays any spilled files once the database is reachable.
+    """
+
+    def __init__(
+        self,
+        buffer_size: int = LOG_CONFIG.buffer_size,
+        flush_interval: float = LOG_CONFIG.flush_interval,
+        chunksize: int = LOG_CONFIG.chunksize,
+        spill_dir: PosixPath = Paths.PREDICTIONS_DIR,
+    ) -> None:
+        """Initializes the PredictionLogService."""
+        self.buffer: deque = deque(maxlen=buffer_size)
+        self.flush_interval: float = flush_interval
+        self.chunksize: int = chunksize
+        self.spill_dir: PosixPath = spill_dir
+        self.dropped: int = 0
+        self._reported_drops: int = 0
+        self._table_ready: bool = False
+        self._lock: threading.Lock = threading.Lock()
+        self._flush_lock: threading.Lock = threading.Lock()
+        self._stop_event: threading.Event = threading.Event()
+        self._worker: None | threading.Thread = None
+
+    def start(self) -> None:
+        """Starts the background thread that flushes 'buffer' every 'flush_interval' seconds."""
+        if self._worker is not None and self._worker.is_alive():
+            return
+        logger.info(
+            f"Starting the prediction log, which flushes every {self.flush_interval} seconds."
+        )
+        self._stop_event.clear()
+        self._worker = threading.Thread(target=self._run, name="prediction-log", daemon=True)
+        self._worker.start()
+
+    def stop(self) -> None:
+        """Stops the background thread and flushes whatever is left in 'buffer'."""
+        self._stop_event.set()
+        if self._worker is not None:
+            self._worker.join()
+            self._worker = None
+        self.flush()
+        logger.info(f"Prediction log stopped. {self.dropped} record(s) were dropped in total.")
+
+    def log(self, record: dict[str, datetime | float | int | str]) -> None:
+        """Adds a served prediction to 'buffer'. If 'buffer' is full, the oldest record is
+        overwritten and counted as dropped, so the caller is never blocked.
+
+        Args:
+            record (dict[str, datetime | float | int | str]): Inputs, prediction, model version,
+            latency, and timestamp of a served prediction.
+        """
+        with self._lock:
+            if len(self.buffer) == self.buffer.maxlen:
+                self.dropped += 1
+            self.buffer.append(record)
+
+    def flush(self) -> int:
+        """Drains 'buffer' and bulk-inserts its records into the 'rentals.predictions' table,
+        falling back to a parquet file under 'spill_dir' if the database write fails. Once the
+        database write succeeds, previously spilled files are replayed into the table.
+
+        Returns:
+            int: Number of records flushed from 'buffer'.
+        """
+        with self._flush_lock:
+            with self._lock:
+                records: list[dict[str, datetime | float | int | str]] = list(self.buffer)
+                self.buffer.clear()
+                new_drops: int = self.dropped - self._reported_drops
+                self._reported_drops = self.dropped
+            if new_drops:
+                logger.warning(
+                    f"The prediction log buffer was full; {new_drops} record(s) were dropped."
+                )
+            spilled: list[PosixPath] = self._spilled_files()
+            if not records and not spilled:
+                return 0
+            try:
+                if not self._table_ready:
+                    create_schema()
+                    create_predictions_table()
+                    self._table_ready = True
+                if records:
+                    write_predictions(pd.DataFrame(records), chunksize=self.chunksize)
+            except Exception as e:
+                if records:
+                    logger.warning(
+                        f"Unable to write {len(records)} prediction(s) to the database ({e}). \
+Spilling them to '{self.spill_dir}'."
+                    )
+                    self._spill(pd.DataFrame(records))
+                return len(records)
+            self._replay(spilled)
+            return len(records)
+
+    def _spilled_files(self) -> list[PosixPath]:
+        """Returns the parquet files under 'spill_dir', from oldest to newest.
+
+        Returns:
+            list[PosixPath]: Spilled parquet files.
+        """
+        return sorted(self.spill_dir.glob("*.parquet")) if self.spill_dir.exists() else []
+
+    def _replay(self, paths: list[PosixPath]) -> None:
+        """Writes each spilled parquet file to the 'rentals.predictions' table and deletes it,
+        stopping at the first file that can't be written.
+
+        Args:
+            paths (list[PosixPath]): Spilled parquet files, from oldest to newest.
+        """
+        for path in paths:
+            try:
+                write_predictions(pd.read_parquet(path), chunksize=self.chunksize)
+            except Exception as e:
+                logger.warning(f"Unable to replay '{path}' to the database ({e}).")
+                return
+            path.unlink()
+            logger.info(f"Replayed '{path}' to the database.")
+
+    def _spill(self, data: pd.DataFrame) -> None:
+        """Writes 'data' to a timestamped parquet file under 'spill_dir'.
+
+        Args:
+            data (pd.DataFrame): Served predictions, one record per row.
+        """
+        self.spill_dir.mkdir(parents=True, exist_ok=True)
+        # year-first names sort chronologically, so the files are replayed in order
+        file_name: str = f"{datetime.now().strftime('%Y_%m_%d_%H_%M_%S_%f')}.parquet"
+        data.to_parquet(self.spill_dir / file_name, index=False)
+
+    def _run(self) -> None:
+        """Flushes 'buffer' every 'flush_interval' seconds until 'stop' is called."""
+        while not self._stop_event.wait(self.flush_interval):
+            try:
+                self.flush()
+            except Exception as e:
+                logger.exception(f"Prediction log flush failed: {e}")
+
+
+def load_predictions(
+    limit: int = 5000,
+    spill_dir: PosixPath = Paths.PREDICTIONS_DIR,
+) -> pd.DataFrame:
+    """Returns the most recent served predictions from the 'rentals.predictions' table and the
+    parquet files spilled to 'spill_dir'.
+
+    Args:
+        limit (int, optional): Maximum number of predictions to return. Defaults to 5000.
+        spill_dir (PosixPath, optional): Directory containing spilled parquet files.
+        Defaults to Paths.PREDICTIONS_DIR.
+
+    Returns:
+        pd.DataFrame: Served predictions, ordered from oldest to newest. Empty if none exist.
+    """
+    try:
+        frames: list[pd.DataFrame] = []
+        try:
+            frames.append(read_predictions(limit))
+        except Exception as e:
+            logger.warning(f"Unable to read predictions from the database ({e}).")
+        if spill_dir.exists():
+            frames.extend(pd.read_parquet(path) for path in sorted(spill_dir.glob("*.parquet")))
+        frames = [frame for frame in frames if not frame.empty]
+        if not frames:
+            return pd.DataFrame()
+        return (
+            pd.concat(frames, ignore_index=True)
+            .sort_values("created_at", kind="stable")
+            .tail(limit)
+            .reset_index(drop=True)
+        )
+    except Exception as e:
+        raise e
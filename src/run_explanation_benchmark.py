@@ -0,0 +1,114 @@
+"""This module provides the functionality for benchmarking explanations against predictions."""
+
+import random
+import time
+
+from collections.abc import Callable
+
+import pandas as pd
+
+from xgboost import Booster, DMatrix
+
+from src.logger import logger
+from src.model_inference import ModelInferenceService, clear_explanation_cache
+
+
+def time_call(func: Callable[[], object], n_repeats: int = 10) -> float:
+    """Returns the best wall-clock time, in seconds, of 'n_repeats' calls to 'func'.
+
+    Args:
+        func (Callable[[], object]): Function being timed.
+        n_repeats (int, optional): Number of calls. Defaults to 10.
+
+    Returns:
+        float: Best wall-clock time, in seconds.
+    """
+    try:
+        timings: list[float] = []
+        for _ in range(n_repeats):
+            start: float = time.perf_counter()
+            func()
+            timings.append(time.perf_counter() - start)
+        return min(timings)
+    except Exception as e:
+        raise e
+
+
+@logger.catch
+def main(batch_size: int = 1000) -> None:
+    """Benchmarks the booster's native feature contributions and feature interactions, and
+    'ModelInferenceService.explain_batch' with a cold and a warm cache, against plain
+    predictions on a batch of random input records.
+
+    Args:
+        batch_size (int, optional): Number of input records. Defaults to 1000.
+    """
+    try:
+        logger.info(f"Benchmarking explanations on a batch of {batch_size} record(s)...")
+        # create the input records
+        records: list[dict[str, float | int | str]] = [
+            {
+                "year_built": random.choice(range(1900, 2024)),
+                "area": random.choice(range(0, 300)),
+                "bedrooms": random.choice(range(1, 6)),
+                "bathrooms": random.choice(range(1, 4)),
+                "furnished": random.choice(["no", "yes"]),
+                "storage": random.choice(["no", "yes"]),
+                "garage": random.choice(["no", "yes"]),
+                "parking": random.choice(["no", "yes"]),
+                "balcony": random.choice(["no", "yes"]),
+                "garden_size": random.choice(range(0, 500)),
+                "neighborhood_id": random.choice(range(1, 283))
+            }
+            for _ in range(batch_size)
+        ]
+
+        # instantiate an object of type, 'ModelInferenceService', and load the trained ML model
+        service: ModelInferenceService = ModelInferenceService()
+        service.load_model()
+
+        # transform the records once, so the booster calls time only the model's cost, and score
+        # the same boosting rounds as 'model.predict' and 'explain_batch'
+        x: pd.DataFrame = service.transform(records)
+        booster: Booster = service.model.get_booster()
+        iteration_range: tuple[int, int] = service.iteration_range()
+
+        # 'explain_batch' also pays for 'transform', as the '/predict/explain' endpoint does
+        def explain_cold(interactions: bool) -> None:
+            clear_explanation_cache()
+            service.explain_batch(records, interactions)
+
+        timings: dict[str, float] = {
+            "predict": time_call(
+                lambda: booster.predict(DMatrix(x), iteration_range=iteration_range)
+            ),
+            "pred_contribs": time_call(
+                lambda: booster.predict(
+                    DMatrix(x), pred_contribs=True, iteration_range=iteration_range
+                )
+            ),
+            "pred_interactions": time_call(
+                lambda: booster.predict(
+                    DMatrix(x), pred_interactions=True, iteration_range=iteration_range
+                )
+            ),
+            "explain_batch (cold cache)": time_call(lambda: explain_cold(False)),
+            "explain_batch (warm cache)": time_call(lambda: service.explain_batch(records)),
+            "explain_batch with interactions (cold cache)": time_call(
+                lambda: explain_cold(True)
+            ),
+            "explain_batch with interactions (warm cache)": time_call(
+                lambda: service.explain_batch(records, interactions=True)
+            ),
+        }
+        for name, seconds in timings.items():
+            logger.info(
+                f"{name}: {seconds * 1000:.2f} ms per batch, {seconds * 1e6 / batch_size:.2f} µs \
+per record, {seconds / timings['predict']:.1f}x the cost of 'predict'."
+            )
+    except Exception as e:
+        raise e
+
+
+if __name__ == "__main__":
+    main()
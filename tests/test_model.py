@@ -0,0 +1,132 @@
+"""Tests for the model evaluation functions."""
+
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.model import (
+    bootstrap_metrics,
+    compute_drift,
+    compute_group_errors,
+    compute_metrics,
+    compute_rsquared,
+    make_folds,
+)
+
+
+@pytest.fixture
+def rng() -> np.random.Generator:
+    """Returns a seeded random number generator."""
+    return np.random.default_rng(0)
+
+
+def test_compute_metrics_matches_hand_computed_values() -> None:
+    y: np.ndarray = np.array([100.0, 200.0, 300.0, 400.0])
+    yhat: np.ndarray = np.array([110.0, 190.0, 330.0, 400.0])
+    metrics: dict[str, np.ndarray] = compute_metrics(y, yhat)
+    assert round(float(metrics["r_squared"]), 2) == compute_rsquared(y, yhat)
+    assert metrics["mae"] == pytest.approx((10 + 10 + 30 + 0) / 4)
+    assert metrics["mape"] == pytest.approx((0.1 + 0.05 + 0.1 + 0) / 4)
+
+
+def test_compute_metrics_ignores_zero_labels_in_mape() -> None:
+    metrics: dict[str, np.ndarray] = compute_metrics(np.array([0.0, 100.0]), np.array([5.0, 90.0]))
+    assert metrics["mape"] == pytest.approx(0.1)
+
+
+def test_compute_metrics_scores_each_row_of_a_batch(rng: np.random.Generator) -> None:
+    y: np.ndarray = rng.uniform(500, 3000, size=(4, 50))
+    yhat: np.ndarray = y + rng.normal(0, 100, size=y.shape)
+    batch: dict[str, np.ndarray] = compute_metrics(y, yhat)
+    for i in range(y.shape[0]):
+        row: dict[str, np.ndarray] = compute_metrics(y[i], yhat[i])
+        for metric, values in batch.items():
+            assert values[i] == pytest.approx(row[metric])
+
+
+def test_bootstrap_metrics_brackets_the_point_estimate(rng: np.random.Generator) -> None:
+    y: np.ndarray = rng.uniform(500, 3000, size=200)
+    yhat: np.ndarray = y + rng.normal(0, 100, size=y.shape)
+    for bounds in bootstrap_metrics(y, yhat, n_bootstrap=200).values():
+        assert bounds["lower"] <= bounds["estimate"] <= bounds["upper"]
+
+
+def test_compute_group_errors() -> None:
+    errors: dict[str, dict[str, float]] = compute_group_errors(
+        np.array([100.0, 200.0, 400.0]),
+        np.array([110.0, 180.0, 400.0]),
+        np.array([1, 1, 2]),
+    )
+    assert errors["1"] == pytest.approx({"n": 2, "mae": 15.0, "mape": 0.1})
+    assert errors["2"] == pytest.approx({"n": 1, "mae": 0.0, "mape": 0.0})
+
+
+def test_compute_drift_is_zero_for_identical_distributions(rng: np.random.Generator) -> None:
+    data: pd.DataFrame = pd.DataFrame({
+        "area": rng.uniform(20, 300, size=1000),
+        "furnished": rng.random(1000) < 0.3,
+    })
+    for feature in compute_drift(data, data).values():
+        assert feature["psi"] == pytest.approx(0, abs=1e-9)
+
+
+def test_compute_drift_detects_a_shift(rng: np.random.Generator) -> None:
+    reference: pd.DataFrame = pd.DataFrame({"furnished": rng.random(1000) < 0.3})
+    current: pd.DataFrame = pd.DataFrame({"furnished": rng.random(1000) < 0.9})
+    assert compute_drift(reference, current)["furnished"]["psi"] > 0.25
+
+
+def test_compute_group_errors_reports_undefined_mape_as_none() -> None:
+    errors: dict[str, dict[str, None | float]] = compute_group_errors(
+        np.array([0.0, 100.0]), np.array([10.0, 90.0]), np.array([1, 2])
+    )
+    assert errors["1"]["mape"] is None
+    json.dumps(errors, allow_nan=False)
+
+
+def test_compute_drift_bins_ids_by_value() -> None:
+    # neighboring IDs share a quantile bin, but they're different neighborhoods
+    reference: pd.DataFrame = pd.DataFrame({"neighborhood_id": [10] * 500 + [12] * 500})
+    current: pd.DataFrame = pd.DataFrame({"neighborhood_id": [11] * 500 + [12] * 500})
+    drift: dict[str, None | float] = compute_drift(reference, current)["neighborhood_id"]
+    assert drift["psi"] > 0.25
+    assert drift["reference_mean"] is None and drift["current_mean"] is None
+
+
+def test_compute_drift_handles_unmapped_binary_values(rng: np.random.Generator) -> None:
+    # 'Yes' isn't a known binary value, so encoding it yields only nulls
+    reference: pd.DataFrame = pd.DataFrame({
+        "area": rng.uniform(20, 300, size=100),
+        "furnished": rng.random(100) < 0.3,
+    })
+    current: pd.DataFrame = pd.DataFrame({
+        "area": rng.uniform(20, 300, size=10),
+        "furnished": pd.Series([None] * 10, dtype=object),
+    })
+    drift: dict[str, dict[str, None | float]] = compute_drift(reference, current)
+    assert drift["furnished"]["psi"] is None and drift["furnished"]["current_mean"] is None
+    assert drift["furnished"]["reference_mean"] == pytest.approx(reference["furnished"].mean())
+    json.dumps(drift, allow_nan=False)
+
+
+def test_make_folds_time_never_trains_on_later_years(rng: np.random.Generator) -> None:
+    data: pd.DataFrame = pd.DataFrame({"year_built": rng.integers(1900, 2024, size=500)})
+    years: np.ndarray = data["year_built"].to_numpy()
+    folds: list[tuple[np.ndarray, np.ndarray]] = make_folds(data, method="time", n_splits=5)
+    assert len(folds) == 5
+    for train_idx, test_idx in folds:
+        assert years[train_idx].max() <= years[test_idx].min()
+
+
+def test_make_folds_kfold_partitions_the_data() -> None:
+    data: pd.DataFrame = pd.DataFrame({"year_built": np.arange(1900, 2000)})
+    folds: list[tuple[np.ndarray, np.ndarray]] = make_folds(data, method="kfold", n_splits=4)
+    test_idx: np.ndarray = np.sort(np.concatenate([test for _, test in folds]))
+    np.testing.assert_array_equal(test_idx, np.arange(len(data)))
+
+
+def test_make_folds_rejects_unknown_methods() -> None:
+    with pytest.raises(ValueError):
+        make_folds(pd.DataFrame({"year_built": [2000, 2001]}), method="random")
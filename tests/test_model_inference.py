@@ -0,0 +1,119 @@
+"""Tests for the explanations served by the model inference service."""
+
+from collections.abc import Iterator
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from fastapi.testclient import TestClient
+
+from src import data, model_inference
+from src.app import app
+from src.model_inference import (
+    EXPLANATION_CONFIG,
+    ModelInferenceService,
+    clear_explanation_cache,
+)
+
+RECORDS: list[dict[str, float | int | str]] = [
+    {
+        "year_built": 1990 + i,
+        "area": 60.0 + 20 * i,
+        "bedrooms": 1 + i % 4,
+        "bathrooms": 1.0 + i % 2,
+        "furnished": "yes" if i % 2 else "no",
+        "storage": "no",
+        "garage": "yes" if i % 3 else "no",
+        "parking": "no",
+        "balcony": "yes",
+        "garden_size": 5.0 * i,
+        "neighborhood_id": 10 + i,
+    }
+    for i in range(5)
+]
+
+
+@pytest.fixture
+def aggregates(monkeypatch: pytest.MonkeyPatch) -> pd.DataFrame:
+    """Replaces the database's neighborhood aggregates with a mutable pd.DataFrame."""
+    frame: pd.DataFrame = pd.DataFrame({
+        "neighborhood_id": range(1, 283),
+        "neighborhood_mean_area": 80.0,
+        "neighborhood_mean_bedrooms": 2.0,
+        "neighborhood_mean_bathrooms": 1.0,
+        "neighborhood_mean_garden_size": 5.0,
+    })
+    monkeypatch.setattr(data, "aggregate_neighborhood_ids", lambda: frame.copy())
+    return frame
+
+
+@pytest.fixture
+def service(aggregates: pd.DataFrame) -> Iterator[ModelInferenceService]:
+    """Returns a ModelInferenceService with the trained ML model loaded and an empty cache."""
+    clear_explanation_cache()
+    service: ModelInferenceService = ModelInferenceService()
+    service.load_model()
+    yield service
+    clear_explanation_cache()
+
+
+def test_contributions_add_up_to_the_prediction(service: ModelInferenceService) -> None:
+    explanations: list[dict[str, object]] = service.explain_batch(RECORDS, interactions=True)
+    predictions: np.ndarray = service.model.predict(service.transform(RECORDS))
+    for record, explanation, prediction in zip(RECORDS, explanations, predictions):
+        assert list(explanation["contributions"]) == list(service.model.feature_names_in_)
+        total: float = sum(explanation["contributions"].values()) + explanation["bias"]
+        assert total == pytest.approx(prediction, abs=1e-3)
+        assert explanation["prediction"] == service.predict(record)
+        assert set(explanation["interactions"]) == {*service.model.feature_names_in_, "bias"}
+
+
+def test_repeated_rows_are_served_from_the_cache(
+    service: ModelInferenceService,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    explained: list[int] = []
+    explain = service._explain
+
+    def count_rows(x: pd.DataFrame, interactions: bool) -> list[dict[str, object]]:
+        explained.append(len(x))
+        return explain(x, interactions)
+
+    monkeypatch.setattr(service, "_explain", count_rows)
+    first: list[dict[str, object]] = service.explain_batch([RECORDS[0], RECORDS[0], RECORDS[1]])
+    second: list[dict[str, object]] = service.explain_batch([RECORDS[1], RECORDS[0]])
+    assert explained == [2]
+    assert second == [first[2], first[0]]
+
+
+def test_changed_aggregates_miss_the_cache(
+    service: ModelInferenceService,
+    aggregates: pd.DataFrame,
+) -> None:
+    before: dict[str, object] = service.explain_batch([RECORDS[0]])[0]
+    aggregates["neighborhood_mean_area"] = 200.0
+    after: dict[str, object] = service.explain_batch([RECORDS[0]])[0]
+    assert after["contributions"] != before["contributions"]
+    assert len(model_inference._explanation_cache) == 2
+
+
+def test_mutating_a_result_leaves_the_cache_intact(service: ModelInferenceService) -> None:
+    explanation: dict[str, object] = service.explain_batch([RECORDS[0]])[0]
+    area: float = explanation["contributions"]["area"]
+    explanation["contributions"]["area"] = 1e9
+    assert service.explain_batch([RECORDS[0]])[0]["contributions"]["area"] == area
+
+
+@pytest.mark.parametrize("n_records", [0, EXPLANATION_CONFIG.max_batch_size + 1])
+def test_explain_endpoint_rejects_out_of_bounds_batches(n_records: int) -> None:
+    response = TestClient(app).post("/predict/explain", json=[{}] * n_records)
+    assert response.status_code == 422
+
+
+def test_explain_endpoint(service: ModelInferenceService) -> None:
+    response = TestClient(app).post("/predict/explain", json=[{}, {"Beds": 4}])
+    assert response.status_code == 200
+    assert [set(explanation) for explanation in response.json()] == [
+        {"Estimated rent (USD)", "bias", "contributions"}
+    ] * 2
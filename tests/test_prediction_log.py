@@ -0,0 +1,175 @@
+"""Tests for the background prediction log."""
+
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from src import prediction_log
+from src.logger import logger
+from src.prediction_log import PredictionLogService, load_predictions
+
+
+def make_records(n: int) -> list[dict[str, datetime | float | int | str]]:
+    """Returns 'n' served predictions with increasing timestamps."""
+    start: datetime = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    return [
+        {
+            "created_at": start + timedelta(seconds=i),
+            "model_version": "abc123",
+            "neighborhood_id": i + 1,
+            "prediction": 1000 + i,
+            "latency_ms": 1.5,
+        }
+        for i in range(n)
+    ]
+
+
+@pytest.fixture
+def failing_db(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Makes every database write raise."""
+    def raise_error(*args, **kwargs) -> None:
+        raise ConnectionError("database unavailable")
+
+    monkeypatch.setattr(prediction_log, "create_schema", lambda: None)
+    monkeypatch.setattr(prediction_log, "create_predictions_table", lambda: None)
+    monkeypatch.setattr(prediction_log, "write_predictions", raise_error)
+
+
+def test_log_overwrites_oldest_record_and_counts_drops(tmp_path: Path) -> None:
+    service: PredictionLogService = PredictionLogService(buffer_size=2, spill_dir=tmp_path)
+    records = make_records(3)
+    for record in records:
+        service.log(record)
+    assert service.dropped == 1
+    assert list(service.buffer) == records[1:]
+
+
+def test_flush_reports_new_drops_once(tmp_path: Path, failing_db: None) -> None:
+    messages: list[str] = []
+    sink_id: int = logger.add(messages.append, level="WARNING", format="{message}")
+    try:
+        service: PredictionLogService = PredictionLogService(buffer_size=1, spill_dir=tmp_path)
+        for record in make_records(3):
+            service.log(record)
+        service.flush()
+        service.flush()
+    finally:
+        logger.remove(sink_id)
+    drop_messages: list[str] = [message for message in messages if "dropped" in message]
+    assert len(drop_messages) == 1
+    assert "2 record(s) were dropped" in drop_messages[0]
+    assert service.dropped == 2
+
+
+def test_flush_spills_to_parquet_when_db_write_fails(tmp_path: Path, failing_db: None) -> None:
+    service: PredictionLogService = PredictionLogService(spill_dir=tmp_path)
+    records = make_records(2)
+    for record in records:
+        service.log(record)
+    assert service.flush() == 2
+    assert len(service.buffer) == 0
+    spilled: list[Path] = list(tmp_path.glob("*.parquet"))
+    assert len(spilled) == 1
+    pd.testing.assert_frame_equal(pd.read_parquet(spilled[0]), pd.DataFrame(records))
+
+
+def test_flush_writes_to_db(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    written: list[pd.DataFrame] = []
+    monkeypatch.setattr(prediction_log, "create_schema", lambda: None)
+    monkeypatch.setattr(prediction_log, "create_predictions_table", lambda: None)
+    monkeypatch.setattr(
+        prediction_log, "write_predictions", lambda data, chunksize: written.append(data)
+    )
+    service: PredictionLogService = PredictionLogService(spill_dir=tmp_path)
+    for record in make_records(2):
+        service.log(record)
+    assert service.flush() == 2
+    assert service.flush() == 0
+    assert len(written) == 1 and len(written[0]) == 2
+    assert not list(tmp_path.glob("*.parquet"))
+
+
+def test_flush_replays_spilled_files_once_the_db_is_back(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    written: list[pd.DataFrame] = []
+    outage: list[bool] = [True]
+
+    def write_predictions(data: pd.DataFrame, chunksize: int) -> None:
+        if outage[0]:
+            raise ConnectionError("database unavailable")
+        written.append(data)
+
+    monkeypatch.setattr(prediction_log, "create_schema", lambda: None)
+    monkeypatch.setattr(prediction_log, "create_predictions_table", lambda: None)
+    monkeypatch.setattr(prediction_log, "write_predictions", write_predictions)
+    service: PredictionLogService = PredictionLogService(spill_dir=tmp_path)
+    records = make_records(3)
+    for record in records[:2]:
+        service.log(record)
+        service.flush()
+    assert len(list(tmp_path.glob("*.parquet"))) == 2
+
+    # the next flush writes the new record, then replays the spilled ones and deletes them
+    outage[0] = False
+    service.log(records[2])
+    assert service.flush() == 1
+    assert not list(tmp_path.glob("*.parquet"))
+    pd.testing.assert_frame_equal(
+        pd.concat(written, ignore_index=True).sort_values("created_at", ignore_index=True),
+        pd.DataFrame(records),
+    )
+
+
+def test_flush_replays_spilled_files_with_an_empty_buffer(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    written: list[pd.DataFrame] = []
+    monkeypatch.setattr(prediction_log, "create_schema", lambda: None)
+    monkeypatch.setattr(prediction_log, "create_predictions_table", lambda: None)
+    monkeypatch.setattr(
+        prediction_log, "write_predictions", lambda data, chunksize: written.append(data)
+    )
+    records: pd.DataFrame = pd.DataFrame(make_records(2))
+    records.to_parquet(tmp_path / "spilled.parquet", index=False)
+    assert PredictionLogService(spill_dir=tmp_path).flush() == 0
+    assert not list(tmp_path.glob("*.parquet"))
+    pd.testing.assert_frame_equal(written[0], records)
+
+
+def test_flush_keeps_spilled_files_while_the_db_is_down(tmp_path: Path, failing_db: None) -> None:
+    pd.DataFrame(make_records(1)).to_parquet(tmp_path / "spilled.parquet", index=False)
+    service: PredictionLogService = PredictionLogService(spill_dir=tmp_path)
+    assert service.flush() == 0
+    assert [path.name for path in tmp_path.glob("*.parquet")] == ["spilled.parquet"]
+
+
+def test_load_predictions_merges_db_and_spilled_rows(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    records: pd.DataFrame = pd.DataFrame(make_records(3))
+    monkeypatch.setattr(prediction_log, "read_predictions", lambda limit: records.iloc[[0, 2]])
+    records.iloc[[1]].to_parquet(tmp_path / "spilled.parquet", index=False)
+    pd.testing.assert_frame_equal(
+        load_predictions(limit=2, spill_dir=tmp_path),
+        records.iloc[1:].reset_index(drop=True),
+    )
+
+
+def test_load_predictions_falls_back_to_spilled_rows(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    def raise_error(limit: int) -> pd.DataFrame:
+        raise ConnectionError("database unavailable")
+
+    records: pd.DataFrame = pd.DataFrame(make_records(2))
+    monkeypatch.setattr(prediction_log, "read_predictions", raise_error)
+    records.to_parquet(tmp_path / "spilled.parquet", index=False)
+    pd.testing.assert_frame_equal(load_predictions(spill_dir=tmp_path), records)
+    assert load_predictions(spill_dir=tmp_path / "missing").empty